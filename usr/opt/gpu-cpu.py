@@ -2,31 +2,127 @@
 
 import psutil
 import tkinter as tk
-from tkinter import ttk, font
+from tkinter import ttk, font, messagebox
 import subprocess
 import json
 import os
+import argparse
+import atexit
+import threading
+import glob
+import time
+import functools
+import shutil
+
+try:
+    import pynvml  # NVML-Bindings, ersetzen den nvidia-smi-Aufruf
+except ImportError:
+    pynvml = None
+
+try:
+    import pyamdgpuinfo  # libdrm-Bindings, ersetzen den radeontop-Aufruf
+except ImportError:
+    pyamdgpuinfo = None
+
+_DEPS_BOOTSTRAPPED = False  # Abhängigkeiten nur einmal pro Programmlauf installieren
+_GPU_BACKEND = None  # Beim Start erkannte GPU-Abfrage (siehe _probe_gpu_backend)
+
+# Letzter Messwert-Snapshot des Hintergrund-Threads (geschützt durch _info_lock)
+_info_lock = threading.Lock()
+_system_info = {"cpu": "CPU: ...", "gpu": "GPU: ...", "ram": "RAM: ..."}
+_POLL_INTERVAL = 1.0  # Sekunden zwischen zwei Messungen
+_UI_INTERVAL = 0.25  # Sekunden zwischen zwei Aktualisierungen der Anzeige
+_next_ui_tick = 0.0  # Deadline (time.monotonic) für den nächsten update_temps-Aufruf
+_INV_GIB = 1.0 / (1 << 30)  # Bytes -> GB als Multiplikation statt Division
+_current_tick = 0  # Wird vom Hintergrund-Thread pro Messdurchlauf hochgezählt
+
+# Erster Aufruf initialisiert den internen Zähler, danach liefert cpu_percent sofort
+psutil.cpu_percent(interval=None)
+
+def tick_cache(fn):
+    """Merkt sich das Ergebnis von fn bis zum nächsten Messdurchlauf (_current_tick)."""
+    cache = {}
+
+    @functools.wraps(fn)
+    def wrapper(*args):
+        if cache.get("tick") == _current_tick:
+            return cache["value"]
+        value = fn(*args)
+        cache.update(tick=_current_tick, value=value)
+        return value
+
+    return wrapper
+
+def _open_sysfs(path):
+    """Öffnet eine sysfs-Datei einmalig und liefert den Dateideskriptor (oder None)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    atexit.register(os.close, fd)
+    return fd
+
+def _read_sysfs_int(fd):
+    """Liest einen Ganzzahlwert ohne erneutes Öffnen aus einem sysfs-Deskriptor."""
+    return int(os.pread(fd, 16, 0))
+
+def _read_drm_vendor():
+    """Liefert die PCI-Hersteller-ID der ersten Grafikkarte (z. B. "0x1002") oder None."""
+    try:
+        with open("/sys/class/drm/card0/device/vendor", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
 
-def get_cpu_temp():
-    """Liest die CPU-Temperatur aus."""
+_THERMAL_FD = _open_sysfs("/sys/class/thermal/thermal_zone0/temp")
+
+# CPU- und GPU-Abfrage teilen sich einen hwmon-Scan pro Messdurchlauf
+_sensors_temperatures = tick_cache(psutil.sensors_temperatures)
+
+def _find_core_sensor():
+    """Sucht einmalig den "core"-Sensor und liefert (Chip, Index) oder (None, None)."""
     try:
         temps = psutil.sensors_temperatures()
         for key, entries in temps.items():
-            for entry in entries:
+            for idx, entry in enumerate(entries):
                 if "core" in entry.label.lower():
-                    return f"{entry.current:.1f}°C"
+                    return key, idx
     except Exception as e:
-        print(f"Fehler beim Auslesen der CPU-Temperatur: {e}")
-    try:
-        with open("/sys/class/thermal/thermal_zone0/temp", "r") as f:
-            temp = int(f.read()) / 1000.0
-            return f"{temp:.1f}°C"
-    except FileNotFoundError:
+        print(f"Fehler beim Suchen des CPU-Temperatursensors: {e}")
+    return None, None
+
+_TEMP_CHIP, _TEMP_IDX = _find_core_sensor()
+
+@tick_cache
+def get_cpu_temp():
+    """Liest die CPU-Temperatur aus."""
+    if _TEMP_CHIP is not None:
+        try:
+            entry = _sensors_temperatures()[_TEMP_CHIP][_TEMP_IDX]
+            return f"{entry.current:.1f}°C"
+        except Exception as e:
+            print(f"Fehler beim Auslesen der CPU-Temperatur: {e}")
+    if _THERMAL_FD is None:
         print("Fehler: /sys/class/thermal/thermal_zone0/temp nicht gefunden.")
+        return "N/A"
+    try:
+        temp = _read_sysfs_int(_THERMAL_FD) / 1000.0
+        return f"{temp:.1f}°C"
+    except (OSError, ValueError) as e:
+        print(f"Fehler beim Lesen von /sys/class/thermal/thermal_zone0/temp: {e}")
     return "N/A"
 
 def install_gpu_dependencies():
     """Versucht, die benötigten Pakete für die GPU-Temperaturmessung zu installieren."""
+    global _DEPS_BOOTSTRAPPED
+    if _DEPS_BOOTSTRAPPED:
+        return
+    _DEPS_BOOTSTRAPPED = True
+
+    if hasattr(os, "geteuid") and os.geteuid() != 0:
+        print("Warnung: Für die Installation der GPU-Pakete werden Root-Rechte benötigt.")
+        return  # Paketmanager würde ohnehin scheitern
+
     package_managers = {
         "apt-get": ["nvidia-utils", "radeontop", "lm-sensors"],
         "dnf": ["nvidia-settings", "radeontop", "lm-sensors"],
@@ -35,27 +131,22 @@ def install_gpu_dependencies():
     }
 
     for pm, packages in package_managers.items():
-        try:
-            subprocess.check_call(["which", pm])
-            for package in packages:
-                try:
-                    subprocess.check_call([pm, "install", "-y", package])
-                except subprocess.CalledProcessError:
-                    pass  # Paket eventuell schon installiert
-            return  # Erfolgreiche Installation
-        except subprocess.CalledProcessError:
-            pass  # Paketmanager nicht gefunden
+        if shutil.which(pm) is None:
+            continue  # Paketmanager nicht gefunden
+        for package in packages:
+            try:
+                subprocess.check_call([pm, "install", "-y", package])
+            except subprocess.CalledProcessError:
+                pass  # Paket eventuell schon installiert
+        return  # Erfolgreiche Installation
 
     print("Warnung: Konnte keine passenden Pakete für die GPU-Temperaturmessung finden.")
 
 def get_gpu_temp():
     """Versucht, die GPU-Temperatur für verschiedene Hersteller auszulesen."""
-    install_gpu_dependencies()  # Abhängigkeiten installieren (falls nötig)
-
     try:
         # NVIDIA
-        output = subprocess.check_output(["nvidia-smi", "--query-gpu=temperature.gpu", "--format=csv,noheader"])
-        temp = output.decode('utf-8').strip()
+        temp = _query_nvidia_smi()[0]
         return f"{temp}°C (NVIDIA)"
     except (FileNotFoundError, subprocess.CalledProcessError):
         pass
@@ -72,18 +163,15 @@ def get_gpu_temp():
         pass
 
     try:
-        # Intel (mit sensors)
-        output = subprocess.check_output(["sensors"])
-        lines = output.decode('utf-8').splitlines()
-        for line in lines:
-            if "Package id 0" in line:
-                temp = line.split(":")[1].strip().split()[0]
-                return f"{temp} (Intel)"
-    except (FileNotFoundError, subprocess.CalledProcessError):
+        # Intel (über psutil/coretemp)
+        temp = get_intel_info()[0]
+        if temp != "N/A":
+            return f"{temp} (Intel)"
+    except (KeyError, IndexError):
         pass
 
-    if "N/A" not in get_gpu_temp():  # Grafikkarte erkannt
-        tk.messagebox.showwarning(
+    if os.path.exists("/sys/class/drm/card0"):  # Grafikkarte erkannt
+        messagebox.showwarning(
             "Fehlende Abhängigkeit",
             "Grafikkarte erkannt, aber die benötigte Abhängigkeit für die Temperaturmessung fehlt.\n"
             "Bitte installieren Sie die entsprechenden Pakete manuell."
@@ -91,69 +179,96 @@ def get_gpu_temp():
 
     return "N/A"  # Kein unterstützter Hersteller gefunden
 
-def get_gpu_temp_and_usage():
-    """Liest GPU-Temperatur und -Auslastung für verschiedene Treiber aus."""
-    temp, usage = "N/A", "N/A"
-
-    # Proprietäre Treiber (NVIDIA, AMD, Intel)
-    for func in [get_nvidia_info, get_amd_info, get_intel_info]:
+def _probe_gpu_backend():
+    """Ermittelt einmalig die erste funktionierende GPU-Abfrage (oder None)."""
+    for func in [get_nvidia_info, get_amd_info, get_intel_info, get_nouveau_info]:
         try:
             temp, usage = func()
-            if temp != "N/A" and usage != "N/A":
-                return temp, usage
+            if temp != "N/A":
+                return func
         except Exception as e:
             print(f"Fehler beim Auslesen der GPU-Daten ({func.__name__}): {e}")
 
-    # Nouveau-Treiber
-    try:
-        temp = get_nouveau_temp()
-        if temp != "N/A":
-            return temp, "N/A"  # Auslastung nicht verfügbar für Nouveau
-    except Exception as e:
-        print(f"Fehler beim Auslesen der Nouveau-Temperatur: {e}")
-
-    # Wenn keine GPU-Daten gefunden werden
-    if temp == "N/A" and usage == "N/A":
-        install_gpu_dependencies()  # Erneut versuchen, Abhängigkeiten zu installieren
-
-        temp, usage = get_gpu_temp_and_usage()  # Erneut versuchen, Daten auszulesen
+    print("Warnung: Es wurde keine kompatible GPU gefunden oder die erforderlichen Abhängigkeiten fehlen.")
+    return None
 
-        if temp == "N/A" and usage == "N/A":
-            tk.messagebox.showwarning(
-                "GPU nicht gefunden",
-                "Es wurde keine kompatible GPU gefunden oder die erforderlichen Abhängigkeiten fehlen.\n"
-                "Bitte installieren Sie die entsprechenden Pakete manuell."
-            )
+def _no_gpu_info():
+    """Platzhalter, wenn keine GPU-Abfrage funktioniert."""
+    return "N/A", "N/A"
 
-    return temp, usage
+# Wird nach der Erkennung direkt auf die passende Abfrage gesetzt (siehe unten)
+get_gpu_temp_and_usage = _no_gpu_info
 
 def get_cpu_usage():
     """Liest die CPU-Auslastung aus."""
-    return f"{psutil.cpu_percent(interval=1):.1f}%"
+    return f"{psutil.cpu_percent(interval=None):.1f}%"
 
+@tick_cache
 def get_ram_info():
     """Liest den RAM-Verbrauch und die RAM-Auslastung aus."""
     ram = psutil.virtual_memory()
-    total = ram.total / 1024**3  # in GB
-    used = ram.used / 1024**3
+    total = ram.total * _INV_GIB  # in GB
+    used = ram.used * _INV_GIB
     percent = ram.percent
     return f"{used:.1f} GB / {total:.1f} GB ({percent:.1f}%)"
 
-def update_temps():
-    """Aktualisiert die Anzeigen."""
-    try:
-        cpu_temp_label.config(text=f"CPU: {get_cpu_temp()}, {get_cpu_usage()}")
-    except Exception as e:
-        print(f"Fehler bei der Aktualisierung der CPU-Temperatur: {e}")
+def _monitor_loop():
+    """Liest die Sensoren im Hintergrund aus und legt die Texte in _system_info ab."""
+    global _current_tick
+    next_tick = time.monotonic()
+    while True:
+        _current_tick += 1  # Neuer Messdurchlauf, zwischengespeicherte Werte verfallen
+        info = {}
+        try:
+            info["cpu"] = f"CPU: {get_cpu_temp()}, {get_cpu_usage()}"
+        except Exception as e:
+            print(f"Fehler bei der Aktualisierung der CPU-Temperatur: {e}")
 
-    try:
-        gpu_temp, gpu_usage = get_gpu_temp_and_usage()
-        gpu_temp_label.config(text=f"GPU: {gpu_temp}, {gpu_usage}")  # Anzeige von Temperatur und Auslastung
-    except Exception as e:
-        print(f"Fehler bei der Aktualisierung der GPU-Daten: {e}")
+        try:
+            gpu_temp, gpu_usage = get_gpu_temp_and_usage()
+            info["gpu"] = f"GPU: {gpu_temp}, {gpu_usage}"  # Anzeige von Temperatur und Auslastung
+        except Exception as e:
+            print(f"Fehler bei der Aktualisierung der GPU-Daten: {e}")
 
-    ram_label.config(text=f"RAM: {get_ram_info()}")
-    root.after(1000, update_temps)  # Alle 1000ms aktualisieren
+        try:
+            info["ram"] = f"RAM: {get_ram_info()}"
+        except Exception as e:
+            print(f"Fehler bei der Aktualisierung der RAM-Daten: {e}")
+
+        with _info_lock:
+            _system_info.update(info)
+
+        # Bis zur nächsten festen Deadline schlafen, damit die Messdauer nicht aufläuft
+        next_tick += _POLL_INTERVAL
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_tick = time.monotonic()  # Deadline verpasst: neu ausrichten statt nachholen
+
+def update_temps():
+    """Aktualisiert die Anzeigen."""
+    global _next_ui_tick
+    with _info_lock:
+        cpu_text = _system_info["cpu"]
+        gpu_text = _system_info["gpu"]
+        ram_text = _system_info["ram"]
+
+    # Nur bei Änderungen setzen, sonst muss Tk das Label nicht neu zeichnen
+    if cpu_text != _get_cpu():
+        _set_cpu(cpu_text)
+    if gpu_text != _get_gpu():
+        _set_gpu(gpu_text)
+    if ram_text != _get_ram():
+        _set_ram(ram_text)
+
+    # Nächsten Aufruf an einer festen Deadline ausrichten (alle 250ms)
+    _next_ui_tick += _UI_INTERVAL
+    delay = _next_ui_tick - time.monotonic()
+    if delay <= 0:
+        _next_ui_tick = time.monotonic()  # Deadline verpasst: neu ausrichten statt nachholen
+        delay = 0
+    root.after(int(delay * 1000), update_temps)
 
 def on_right_click(event):
     """Zeigt das Kontextmenü bei Rechtsklick an."""
@@ -167,16 +282,99 @@ def quit_app():
     root.destroy()
 # Neue Funktionen für GPU-Informationen
 
+def _init_nvml():
+    """Initialisiert NVML einmalig und liefert das Handle der ersten GPU (oder None)."""
+    if pynvml is None:
+        return None
+    try:
+        pynvml.nvmlInit()
+    except pynvml.NVMLError:
+        return None  # Kein NVIDIA-Treiber geladen
+    atexit.register(pynvml.nvmlShutdown)
+    try:
+        return pynvml.nvmlDeviceGetHandleByIndex(0)
+    except pynvml.NVMLError:
+        return None
+
+_NVML_HANDLE = _init_nvml()
+
+_NVIDIA_SMI_TTL = 0.95  # Sekunden; Aufrufer innerhalb eines Ticks teilen sich ein Ergebnis
+_nvidia_smi_cache = {"time": None, "values": None}
+
+def _query_nvidia_smi():
+    """Fragt alle NVIDIA-Werte mit einem einzigen nvidia-smi-Aufruf ab.
+
+    Liefert (Temperatur, Auslastung, Speicher belegt, Speicher gesamt, Leistung) als Strings.
+    """
+    now = time.monotonic()
+    if _nvidia_smi_cache["time"] is not None and now - _nvidia_smi_cache["time"] < _NVIDIA_SMI_TTL:
+        return _nvidia_smi_cache["values"]
+
+    output = subprocess.check_output([
+        "nvidia-smi",
+        "--query-gpu=temperature.gpu,utilization.gpu,memory.used,memory.total,power.draw",
+        "--format=csv,noheader,nounits",
+    ])
+    line = output.decode("utf-8").splitlines()[0]  # Erste GPU
+    values = tuple(field.strip() for field in line.split(","))
+    _nvidia_smi_cache.update(time=now, values=values)
+    return values
+
 def get_nvidia_info():
     """Liest Temperatur und Auslastung für NVIDIA GPUs aus."""
-    output = subprocess.check_output(
-        ["nvidia-smi", "--query-gpu=temperature.gpu,utilization.gpu", "--format=csv,noheader"]
-    )
-    temp, usage = output.decode("utf-8").strip().split(",")
-    return f"{temp}°C", f"{usage} (NVIDIA)"
+    if _NVML_HANDLE is not None:
+        temp = pynvml.nvmlDeviceGetTemperature(_NVML_HANDLE, pynvml.NVML_TEMPERATURE_GPU)
+        usage = pynvml.nvmlDeviceGetUtilizationRates(_NVML_HANDLE).gpu
+        return f"{temp}°C", f"{usage} % (NVIDIA)"
+
+    # Fallback ohne pynvml: nvidia-smi
+    temp, usage = _query_nvidia_smi()[:2]
+    return f"{temp}°C", f"{usage} % (NVIDIA)"
+
+def _init_amdgpu():
+    """Liefert die erste AMD-GPU über pyamdgpuinfo (oder None)."""
+    if pyamdgpuinfo is None:
+        return None
+    try:
+        if pyamdgpuinfo.detect_gpus() == 0:
+            return None
+        return pyamdgpuinfo.get_gpu(0)
+    except Exception:
+        return None  # Kein amdgpu-Treiber bzw. kein Zugriff auf DRM
+
+_AMD_GPU = _init_amdgpu()
+
+def _init_amd_sysfs():
+    """Öffnet Temperatur- und Auslastungsdatei des amdgpu-Treibers (oder (None, None))."""
+    device = "/sys/class/drm/card0/device"
+    if _read_drm_vendor() != "0x1002":  # Keine AMD-Karte
+        return None, None
+
+    temp_paths = sorted(glob.glob(f"{device}/hwmon/hwmon*/temp1_input"))
+    if not temp_paths:
+        return None, None
+    temp_fd = _open_sysfs(temp_paths[0])
+    busy_fd = _open_sysfs(f"{device}/gpu_busy_percent")
+    if temp_fd is None or busy_fd is None:
+        return None, None
+    return temp_fd, busy_fd
+
+_AMD_TEMP_FD, _AMD_BUSY_FD = _init_amd_sysfs()
 
 def get_amd_info():
     """Liest Temperatur und Auslastung für AMD GPUs aus."""
+    if _AMD_TEMP_FD is not None:
+        temp = _read_sysfs_int(_AMD_TEMP_FD) / 1000.0
+        usage = _read_sysfs_int(_AMD_BUSY_FD)
+        return f"{temp:.1f}°C", f"{usage} % (AMD)"
+
+    # Fallback ohne sysfs-Zugriff: pyamdgpuinfo
+    if _AMD_GPU is not None:
+        temp = _AMD_GPU.query_temperature()
+        usage = _AMD_GPU.query_load() * 100
+        return f"{temp:.1f}°C", f"{usage:.0f} % (AMD)"
+
+    # Letzter Fallback: radeontop
     output = subprocess.check_output(["radeontop", "-d", "1", "-l", "1"])
     lines = output.decode('utf-8').splitlines()
     temp, usage = "N/A", "N/A"
@@ -187,9 +385,15 @@ def get_amd_info():
             usage = line.split(":")[1].strip()
     return f"{temp}°C", f"{usage} (AMD)"
 
+_INTEL_GPU = _read_drm_vendor() == "0x8086"
+
 def get_intel_info():
     """Liest Temperatur und Auslastung für Intel GPUs aus."""
-    # ... (Ihr vorhandener Code für Intel-GPUs)
+    if not _INTEL_GPU:
+        return "N/A", "N/A"
+    # Integrierte GPU sitzt auf dem CPU-Die; Package-Temperatur aus coretemp
+    entry = _sensors_temperatures()["coretemp"][0]
+    return f"{entry.current:.1f}°C", "N/A (Intel)"
 
 def get_nouveau_temp():
     """Liest die Temperatur für Nouveau-Treiber aus."""
@@ -201,6 +405,16 @@ def get_nouveau_temp():
         pass  # nvidia-settings nicht gefunden oder Fehler
     return "N/A"
 
+def get_nouveau_info():
+    """Liest die Temperatur für Nouveau-Treiber aus (Auslastung nicht verfügbar)."""
+    return get_nouveau_temp(), "N/A"
+
+# Kommandozeilenargumente
+parser = argparse.ArgumentParser(description="Systemüberwachung für CPU, GPU und RAM")
+parser.add_argument("--install-deps", action="store_true",
+                    help="Benötigte Pakete für die GPU-Temperaturmessung beim Start installieren")
+args = parser.parse_args()
+
 # GUI erstellen
 root = tk.Tk()
 root.title("Systemüberwachung")
@@ -212,14 +426,24 @@ style.theme_use('clam')  # Oder ein anderes Theme
 # System-Schriftart ermitteln
 default_font = font.nametofont("TkDefaultFont")
 
+# Anzeigetexte für CPU, GPU und RAM
+cpu_var = tk.StringVar(root, value="CPU: ...")
+gpu_var = tk.StringVar(root, value="GPU: ...")
+ram_var = tk.StringVar(root, value="RAM: ...")
+
+# Gebundene Methoden einmalig auflösen, update_temps nutzt sie bei jedem Tick
+_get_cpu, _set_cpu = cpu_var.get, cpu_var.set
+_get_gpu, _set_gpu = gpu_var.get, gpu_var.set
+_get_ram, _set_ram = ram_var.get, ram_var.set
+
 # Labels für CPU, GPU und RAM (mit System-Schriftart)
-cpu_temp_label = ttk.Label(root, text="CPU: ...", font=(default_font.cget("family"), 9))  
+cpu_temp_label = ttk.Label(root, textvariable=cpu_var, font=(default_font.cget("family"), 9))  
 cpu_temp_label.pack(pady=5)
 
-gpu_temp_label = ttk.Label(root, text="GPU: ...", font=(default_font.cget("family"), 9))
+gpu_temp_label = ttk.Label(root, textvariable=gpu_var, font=(default_font.cget("family"), 9))
 gpu_temp_label.pack(pady=5)
 
-ram_label = ttk.Label(root, text="RAM: ...", font=(default_font.cget("family"), 9))
+ram_label = ttk.Label(root, textvariable=ram_var, font=(default_font.cget("family"), 9))
 ram_label.pack(pady=5)
 # Kontextmenü erstellen
 popup_menu = tk.Menu(root, tearoff=0)
@@ -228,7 +452,21 @@ popup_menu.add_command(label="Beenden", command=quit_app)
 # Rechtsklick-Ereignis binden
 root.bind("<Button-3>", on_right_click)
 
+# Abhängigkeiten einmalig installieren (nur auf Wunsch)
+if args.install_deps:
+    install_gpu_dependencies()
+
+# GPU-Abfrage einmalig festlegen; der Hersteller ändert sich zur Laufzeit nicht,
+# daher ruft der Hintergrund-Thread die erkannte Funktion ohne Umweg auf
+_GPU_BACKEND = _probe_gpu_backend()
+get_gpu_temp_and_usage = _GPU_BACKEND or _no_gpu_info
+
+# Sensoren im Hintergrund auslesen, damit die Oberfläche nicht blockiert
+monitor_thread = threading.Thread(target=_monitor_loop, daemon=True)
+monitor_thread.start()
+
 # Erste Aktualisierung und Start der Schleife
+_next_ui_tick = time.monotonic()
 update_temps()
 root.mainloop()
 